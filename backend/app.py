@@ -1,22 +1,96 @@
+import asyncio
+import hashlib
+import logging
+import os
 import uvicorn
+from contextlib import asynccontextmanager
 from typing import List, Optional
-from fastapi import FastAPI, HTTPException
+from cachetools import TTLCache
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import func, or_
-from sqlalchemy.orm import joinedload
-from db import SessionLocal, engine
+from fastapi.responses import JSONResponse, StreamingResponse
+import orjson
+from sqlalchemy import func, inspect, or_, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from db import AsyncSessionLocal, async_engine, get_db
 import models
 import schemas
+from queries import (
+    DEBUG,
+    DELETE_JOB_SKILLS,
+    SELECT_COMPANY_BY_NAME, SELECT_COMPANY_BY_NAME_FOR_UPDATE, SELECT_COMPANY_WITHOUT_NAME,
+    SELECT_JOB_BY_ID, SELECT_JOB_COUNT, SELECT_JOB_ROWS_ESTIMATE, SELECT_JOBS_PAGE,
+    SELECT_SAMPLE_JOB_ROW, SELECT_SKILLS_BY_NAME, SELECT_SKILLS_BY_NAME_FOR_UPDATE,
+    SELECT_SUMMARY_AGGREGATES, SELECT_TOP_SKILLS,
+)
+
+logger = logging.getLogger("job_trends")
+
+# Column names of the jobs table as it exists in the DB, reflected once at startup (restart after migrations)
+JOB_COLUMNS: List[str] = []
+
+# Open the whole connection pool at startup instead of on first demand
+WARM_POOL = bool(os.getenv("WARM_POOL"))
+
+async def warm_pool():
+    """Check out pool_size connections concurrently and return them, so no request pays the connect handshake"""
+    conns = [async_engine.connect() for _ in range(async_engine.pool.size())]
+    results = await asyncio.gather(*(c.start() for c in conns), return_exceptions=True)
+    await asyncio.gather(*(c.close() for c, r in zip(conns, results) if not isinstance(r, BaseException)))
+    errors = [r for r in results if isinstance(r, BaseException)]
+    if errors:
+        raise errors[0]
+    logger.info("✅ Connection pool warmed: %s", async_engine.pool.status())
 
-print("\n🚀 Starting Job Trends API...\n")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create tables, reflect the jobs columns and warm up the pool and hot queries before serving requests"""
+    logger.info("🚀 Starting Job Trends API...")
+    try:
+        async with async_engine.begin() as conn:
+            await conn.run_sync(models.Base.metadata.create_all)
+            logger.info("✅ Database tables created")
+            JOB_COLUMNS[:] = await conn.run_sync(
+                lambda sync_conn: [c["name"] for c in inspect(sync_conn).get_columns("jobs")]
+            )
+
+        if WARM_POOL:
+            await warm_pool()
 
-try:
-    models.Base.metadata.create_all(bind=engine)
-    print("✅ Database tables created")
-except Exception as e:
-    print(f"⚠️ Error: {e}")
+        # Run each hot statement once so SQL compilation happens here rather than
+        # in the first requests; the summary result also primes the analytics cache
+        async with AsyncSessionLocal() as db:
+            for stmt, params in (
+                (SELECT_JOB_COUNT, {}),
+                # Both /jobs chunk shapes: first (OFFSET) and follow-up (job_id > last)
+                (jobs_chunk(SELECT_JOBS_PAGE, 1), {}),
+                (jobs_chunk(SELECT_JOBS_PAGE, 1, last_id=0), {}),
+                (SELECT_JOB_BY_ID, {"job_id": 0}),
+                (SELECT_COMPANY_BY_NAME, {"company_name": ""}),
+                (SELECT_COMPANY_WITHOUT_NAME, {}),
+                (SELECT_SKILLS_BY_NAME, {"names": [""]}),
+            ):
+                (await db.execute(stmt, params)).first()
+            summary = await build_analytics_summary(db)
+            if summary["total_jobs"]:
+                analytics_cache["summary"] = summary
+        logger.info("✅ Hot queries warmed up")
+    except Exception as e:
+        logger.warning("⚠️ Error preparing database: %s", e)
+    yield
 
-app = FastAPI(title="Job Trends API", version="1.0.0")
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (C serializer, much faster than stdlib json)"""
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
+app = FastAPI(
+    title="Job Trends API",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
 
 # CORS - Allow requests from your frontend
 app.add_middleware(
@@ -27,38 +101,72 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-def get_db():
-    try:
-        db = SessionLocal()
-        return db
-    except Exception as e:
-        print(f"❌ DB Connection Error: {e}")
-        return None
+# Analytics summary cache: recomputed at most once a minute, cleared on any job write.
+# The lock makes concurrent cache misses wait for one recompute instead of all querying.
+analytics_cache = TTLCache(maxsize=4, ttl=60)
+analytics_lock = asyncio.Lock()
+
+# Browser/proxy caching for the aggregate endpoints
+CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=60"
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison against an If-None-Match list (proxies that gzip send W/"..." back)"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in (tag.removeprefix("W/") for tag in candidates)
+
+def cacheable_response(request: Request, payload) -> Response:
+    """JSON response with Cache-Control and an ETag; 304 if the client already has this payload"""
+    body = orjson.dumps(payload)
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {"Cache-Control": CACHE_CONTROL, "ETag": etag}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 @app.get("/")
 def read_root():
     return {"message": "Job Trends API is running", "version": "1.0.0"}
 
+async def approximate_job_count(db: AsyncSession):
+    """Row estimate from InnoDB table statistics (no table scan); exact COUNT if stats are empty"""
+    estimate = await db.scalar(SELECT_JOB_ROWS_ESTIMATE)
+    if estimate:
+        return int(estimate)
+    return await db.scalar(SELECT_JOB_COUNT)
+
 @app.get("/health")
-def health_check():
+async def health_check(db: AsyncSession = Depends(get_db)):
     """Health check endpoint to verify database connectivity"""
-    db = get_db()
-    if not db:
-        return {"status": "error", "message": "Database connection failed"}
     try:
-        count = db.query(models.Job).count()
-        print(f"💚 Health check: {count} jobs in database")
+        count = await approximate_job_count(db)
+        logger.debug("💚 Health check: %s jobs in database", count)
         return {"status": "healthy", "jobs": count, "message": "Database connected"}
     except Exception as e:
-        print(f"❌ Health check failed: {e}")
+        logger.error("❌ Health check failed: %s", e)
         return {"status": "error", "message": str(e)}
-    finally:
-        db.close()
 
 @app.get("/analytics/summary")
-def get_analytics_summary():
+async def get_analytics_summary(request: Request, db: AsyncSession = Depends(get_db)):
     """Get analytics summary data for dashboard"""
-    print("\n📊 Analytics summary request received")
+    logger.debug("📊 Analytics summary request received")
+    result = analytics_cache.get("summary")
+    if result is not None:
+        logger.debug("⚡ Analytics summary served from cache")
+        return cacheable_response(request, result)
+
+    async with analytics_lock:
+        result = analytics_cache.get("summary")
+        if result is None:
+            result = await build_analytics_summary(db)
+            if not result["total_jobs"]:
+                return result
+            analytics_cache["summary"] = result
+    return cacheable_response(request, result)
+
+async def build_analytics_summary(db: AsyncSession):
+    """Run the aggregate queries behind /analytics/summary"""
     defaults = {
         "total_jobs": 0, 
         "avg_salary": 0, 
@@ -67,68 +175,43 @@ def get_analytics_summary():
         "work_setting": [], 
         "company_size": []
     }
-    
-    db = get_db()
-    if not db:
-        print("❌ Database connection failed")
-        return defaults
 
     try:
-        total = db.query(models.Job).count()
-        print(f"   📈 Total jobs in DB: {total}")
+        # (kind, label, value) rows, split up by kind below
+        rows = (await db.execute(SELECT_SUMMARY_AGGREGATES)).all()
+
+        total, avg = 0, 0
+        trend, w_set, c_size = [], [], []
+        for kind, label, value in rows:
+            if kind == "total":
+                total = int(value)
+            elif kind == "avg":
+                avg = value or 0
+            elif kind == "year":
+                trend.append((int(label), value))
+            elif kind == "work_setting":
+                w_set.append((label, int(value)))
+            else:
+                c_size.append((label, int(value)))
+        trend.sort()
+        logger.debug("📈 Total jobs in DB: %s", total)
         
         if total == 0:
-            print("⚠️ WARNING: No jobs found in database! Run seed_real_data.py")
+            logger.warning("⚠️ No jobs found in database! Run seed_real_data.py")
             return defaults
 
-        # Average salary
-        avg = db.query(func.avg(models.Job.min_salary)).scalar() or 0
-        print(f"   💰 Average salary: ${avg:,.0f}")
+        logger.debug("💰 Average salary: %s", avg)
+        logger.debug("📅 Years tracked: %d", len(trend))
+        logger.debug("🏠 Work settings: %d", len(w_set))
+        logger.debug("🏢 Company sizes: %d", len(c_size))
         
         # Top skills
         try:
-            skills = db.query(
-                models.Skill.skill_name, 
-                func.count(models.job_skills.c.job_id).label("count")
-            ).select_from(models.Skill).join(
-                models.job_skills,
-                models.Skill.skill_id == models.job_skills.c.skill_id
-            ).group_by(
-                models.Skill.skill_name
-            ).order_by(
-                func.count(models.job_skills.c.job_id).desc()
-            ).limit(10).all()
-            print(f"   🎯 Top skills found: {len(skills)}")
+            skills = (await db.execute(SELECT_TOP_SKILLS)).all()
+            logger.debug("🎯 Top skills found: %d", len(skills))
         except Exception as e:
-            print(f"⚠️ Skills query error: {e}")
+            logger.warning("⚠️ Skills query error: %s", e)
             skills = []
-        
-        # Salary trend by year
-        trend = db.query(
-            models.Job.work_year, 
-            func.avg(models.Job.min_salary)
-        ).filter(
-            models.Job.work_year.isnot(None)
-        ).group_by(models.Job.work_year).order_by(models.Job.work_year).all()
-        print(f"   📅 Years tracked: {len(trend)}")
-        
-        # Work setting distribution
-        w_set = db.query(
-            models.Job.work_setting, 
-            func.count(models.Job.job_id)
-        ).filter(
-            models.Job.work_setting.isnot(None)
-        ).group_by(models.Job.work_setting).all()
-        print(f"   🏠 Work settings: {len(w_set)}")
-        
-        # Company size distribution
-        c_size = db.query(
-            models.Job.company_size, 
-            func.count(models.Job.job_id)
-        ).filter(
-            models.Job.company_size.isnot(None)
-        ).group_by(models.Job.company_size).all()
-        print(f"   🏢 Company sizes: {len(c_size)}")
 
         result = {
             "total_jobs": total,
@@ -139,136 +222,255 @@ def get_analytics_summary():
             "company_size": [{"name": s[0], "count": s[1]} for s in c_size]
         }
         
-        print(f"✅ Analytics summary returned successfully\n")
+        logger.debug("✅ Analytics summary returned successfully")
         return result
         
     except Exception as e:
-        print(f"❌ Error in analytics summary: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Error in analytics summary: %s", e)
         return defaults
-    finally:
-        db.close()
+
+# Compatibility aliases for Analytics3d.jsx: alias -> core key in the /jobs row
+JOB_FIELD_ALIASES = {
+    "Job_Title": "job_title",
+    "Job_Role": "job_title",
+    "job_role": "job_title",
+    "title": "job_title",
+    "Role": "job_title",
+    "Location": "location",
+    "company_location": "location",
+    "employee_residence": "location",
+    "Employment_Type": "employment_type",
+    "employmentType": "employment_type",
+    "EmploymentType": "employment_type",
+    "employment": "employment_type",
+}
+
+# Rows fetched and serialized per round-trip while streaming /jobs
+JOBS_CHUNK_SIZE = 500
+
+def job_list_rows(jobs) -> List[dict]:
+    """Serialize a batch of jobs in one TypeAdapter pass, with compatibility fields for Analytics3d.jsx"""
+    adapter = schemas.JobResponseListAdapter
+    rows = []
+    for job_dict in adapter.dump_python(adapter.validate_python(jobs, from_attributes=True)):
+        job_dict["Company"] = job_dict["company"]["company_name"] if job_dict["company"] else None
+        rows.append({**job_dict, **{alias: job_dict[key] for alias, key in JOB_FIELD_ALIASES.items()}})
+    return rows
+
+def jobs_chunk(q, size: int, skip: int = 0, last_id: Optional[int] = None):
+    """One /jobs chunk: the first applies skip, the rest continue by job_id (keyset) rather than OFFSET"""
+    q = q.limit(size)
+    return q.offset(skip) if last_id is None else q.where(models.Job.job_id > last_id)
+
+async def stream_jobs(q, skip: int, limit: int):
+    """
+    Yield the page as a JSON array, one piece per JOBS_CHUNK_SIZE rows (see jobs_chunk
+    for the paging). Each chunk is a plain buffered query: MySQL can't run the
+    selectinload queries on a connection that has a server-side cursor open.
+    """
+    yield b"["
+    sent = 0
+    last_id = None
+    try:
+        async with AsyncSessionLocal() as db:
+            while sent < limit:
+                chunk = jobs_chunk(q, min(JOBS_CHUNK_SIZE, limit - sent), skip, last_id)
+                jobs = (await db.execute(chunk)).scalars().all()
+                if not jobs:
+                    break
+                # One body message per chunk, not per row
+                body = b",".join(orjson.dumps(row) for row in job_list_rows(jobs))
+                yield (b"," if sent else b"") + body
+                sent += len(jobs)
+                last_id = jobs[-1].job_id
+                db.expunge_all()  # keep the identity map at one chunk
+                if len(jobs) < JOBS_CHUNK_SIZE:
+                    break
+    except Exception as e:
+        # Same contract as before streaming: errors end the list instead of failing the request
+        logger.exception("❌ Error fetching jobs: %s", e)
+    logger.debug("✅ Streamed %d jobs (skip=%d, limit=%d)", sent, skip, limit)
+    yield b"]"
 
 @app.get("/jobs")
-def get_jobs_list(search: Optional[str] = None, skip: int = 0, limit: int = 100):
+async def get_jobs_list(
+    search: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100
+):
     """
     Get list of jobs with optional search and pagination.
-    Returns jobs with compatibility fields for Analytics3d.jsx
+    Returns jobs with compatibility fields for Analytics3d.jsx, streamed in chunks
+    so large pages don't build the whole list in memory.
     """
-    print(f"\n💼 Jobs request: search='{search}', skip={skip}, limit={limit}")
-    
-    db = get_db()
-    if not db:
-        print("❌ Database connection failed")
+    logger.debug("💼 Jobs request: search=%r skip=%d limit=%d", search, skip, limit)
+    q = SELECT_JOBS_PAGE
+
+    # Apply search filter if provided
+    if search:
+        search_pattern = f"%{search}%"
+        q = q.where(or_(
+            models.Job.job_title.ilike(search_pattern),
+            models.Job.location.ilike(search_pattern)
+        ))
+        logger.debug("🔍 Searching for: %r", search)
+
+    # No separate COUNT: the response is just the page
+    return StreamingResponse(stream_jobs(q, skip, limit), media_type="application/json")
+
+# Candidate attribute names on models.Job, in order of preference (CSV imports vary)
+LOCATION_CANDIDATES = ["location", "company_location", "employee_residence"]
+INDUSTRY_CANDIDATES = ["job_category", "industry"]
+
+def _find_job_column(candidates: List[str]):
+    """Return the first models.Job column attribute matching one of the candidate names"""
+    for name in candidates:
+        if hasattr(models.Job, name):
+            return getattr(models.Job, name)
+    return None
+
+# Resolved once at import; the model doesn't change at runtime
+LOCATION_COL = _find_job_column(LOCATION_CANDIDATES)
+INDUSTRY_COL = _find_job_column(INDUSTRY_CANDIDATES)
+
+async def aggregate_jobs_by(db: AsyncSession, column, limit: int):
+    """Top-N job counts for a column, with everything past N folded into an "Other" bucket"""
+    count = func.count(models.Job.job_id)
+    rows = (await db.execute(
+        select(column, count)
+        .where(column.isnot(None))
+        .group_by(column)
+        .order_by(count.desc())
+        .limit(limit)
+    )).all()
+    result = [{"label": label, "count": cnt} for label, cnt in rows]
+
+    if len(rows) == limit:
+        total = await db.scalar(select(func.count(column)))
+        other = total - sum(cnt for _, cnt in rows)
+        if other > 0:
+            result.append({"label": "Other", "count": other})
+    return result
+
+@app.get("/jobs/count")
+async def get_job_count(db: AsyncSession = Depends(get_db)):
+    """Exact number of jobs (full COUNT; /health reports the cheap estimate)"""
+    try:
+        return {"count": await db.scalar(SELECT_JOB_COUNT)}
+    except Exception as e:
+        logger.error("❌ Error counting jobs: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/jobs/agg/location")
+async def agg_by_location_safe(
+    request: Request,
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db)
+):
+    """Job counts per location (top `limit` groups)"""
+    logger.debug("📍 Location aggregation request: limit=%d", limit)
+    if LOCATION_COL is None:
+        logger.warning("⚠️ No location column found (tried %s, jobs has %s)", LOCATION_CANDIDATES, JOB_COLUMNS)
         return []
-    
     try:
-        # Build query with eager loading
-        q = db.query(models.Job).options(
-            joinedload(models.Job.company),
-            joinedload(models.Job.skills)
-        )
-        
-        # Apply search filter if provided
-        if search:
-            search_pattern = f"%{search}%"
-            q = q.filter(or_(
-                models.Job.job_title.ilike(search_pattern),
-                models.Job.location.ilike(search_pattern)
-            ))
-            print(f"   🔍 Searching for: '{search}'")
-        
-        # Get total count before pagination
-        total_count = q.count()
-        print(f"   📊 Found {total_count} jobs matching criteria")
-        
-        # Apply pagination
-        jobs = q.offset(skip).limit(limit).all()
-        print(f"   📦 Returning {len(jobs)} jobs (skip={skip}, limit={limit})")
-        
-        if len(jobs) == 0:
-            print("⚠️ WARNING: Query returned 0 jobs!")
-            print(f"   Total jobs in DB: {db.query(models.Job).count()}")
-        
-        # Convert to dict with compatibility fields
-        result = []
-        for job in jobs:
-            job_dict = {
-                # Core fields
-                "job_id": job.job_id,
-                "job_title": job.job_title,
-                "location": job.location,
-                "min_salary": job.min_salary,
-                "max_salary": job.max_salary,
-                "work_setting": job.work_setting,
-                "work_year": job.work_year,
-                "company_size": job.company_size,
-                "experience_level": job.experience_level,
-                "job_category": job.job_category,
-                "employment_type": job.employment_type,
-                
-                # Compatibility aliases for Analytics3d.jsx
-                "Job_Title": job.job_title,
-                "Job_Role": job.job_title,
-                "job_role": job.job_title,
-                "title": job.job_title,
-                "Role": job.job_title,
-                
-                "Location": job.location,
-                "company_location": job.location,
-                "employee_residence": job.location,
-                
-                "salary": job.min_salary,
-                "Salary": job.min_salary,
-                "Salary_USD": job.min_salary,
-                "salary_usd": job.min_salary,
-                "salary_in_usd": job.min_salary,
-                "salaryInUSD": job.min_salary,
-                
-                "Employment_Type": job.employment_type,
-                "employment_type": job.employment_type,
-                "employmentType": job.employment_type,
-                "EmploymentType": job.employment_type,
-                "employment": job.employment_type,
-                
-                # Related data
-                "company": {"company_name": job.company.company_name} if job.company else None,
-                "Company": job.company.company_name if job.company else None,
-                "skills": [{"skill_name": s.skill_name} for s in job.skills] if job.skills else []
-            }
-            result.append(job_dict)
-        
-        print(f"✅ Successfully returning {len(result)} jobs\n")
-        return result
-        
+        return cacheable_response(request, await aggregate_jobs_by(db, LOCATION_COL, limit))
+    except Exception as e:
+        logger.error("❌ Error aggregating by location: %s", e)
+        return []
+
+@app.get("/jobs/agg/industry")
+async def agg_by_industry_safe(
+    request: Request,
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db)
+):
+    """Job counts per industry (top `limit` groups)"""
+    logger.debug("🏭 Industry aggregation request: limit=%d", limit)
+    if INDUSTRY_COL is None:
+        logger.warning("⚠️ No industry column found (tried %s, jobs has %s)", INDUSTRY_CANDIDATES, JOB_COLUMNS)
+        return []
+    try:
+        return cacheable_response(request, await aggregate_jobs_by(db, INDUSTRY_COL, limit))
     except Exception as e:
-        print(f"❌ Error fetching jobs: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.error("❌ Error aggregating by industry: %s", e)
         return []
-    finally:
-        if db:
-            db.close()
+
+async def debug_job_columns(db: AsyncSession = Depends(get_db)):
+    """Column names of the jobs table plus one sample row, for schema-mismatch debugging"""
+    try:
+        row = (await db.execute(SELECT_SAMPLE_JOB_ROW)).mappings().first()
+        return {"columns": JOB_COLUMNS, "sample": dict(row) if row else None}
+    except Exception as e:
+        logger.error("❌ Error reading sample job: %s", e)
+        return {"columns": JOB_COLUMNS, "sample": None, "error": str(e)}
+
+# Unauthenticated and returns raw rows, so it only exists in development
+if DEBUG:
+    app.get("/debug/job_columns")(debug_job_columns)
+
+async def get_or_create_skills(db: AsyncSession, skill_names: List[str]):
+    """Resolve skill names to Skill objects with one SELECT, upserting any missing ones in one statement"""
+    # MySQL compares skill_name case- and accent-insensitively (utf8mb4_0900_ai_ci), so
+    # "Résumé" finds a stored "Resume"; rows are matched back to the request by collation_key
+    wanted = {}
+    for name in skill_names:
+        wanted.setdefault(models.collation_key(name), name)
+    found = (await db.execute(SELECT_SKILLS_BY_NAME, {"names": list(wanted.values())})).scalars().all()
+    skills = {models.collation_key(s.skill_name): s for s in found}
+
+    missing = [name for key, name in wanted.items() if key not in skills]
+    if missing:
+        # The no-op UPDATE makes a concurrent insert of the same name harmless
+        # and keeps the stored spelling of existing names
+        await db.execute(
+            mysql_insert(models.Skill)
+            .values([{"skill_name": name} for name in missing])
+            .on_duplicate_key_update(skill_name=models.Skill.skill_name)
+        )
+        added = (await db.execute(SELECT_SKILLS_BY_NAME_FOR_UPDATE, {"names": missing})).scalars().all()
+        skills.update((models.collation_key(s.skill_name), s) for s in added)
+
+    # collation_key only approximates the collation; let the DB match anything it missed
+    for key, name in wanted.items():
+        if key not in skills:
+            skills[key] = (await db.execute(SELECT_SKILLS_BY_NAME_FOR_UPDATE, {"names": [name]})).scalar_one()
+
+    # Two spellings can still resolve to one row; job_skills takes each skill once
+    return list({s.skill_id: s for s in (skills[key] for key in wanted)}.values())
+
+async def get_or_create_company(db: AsyncSession, company_name: Optional[str]):
+    """Look up a company by name, upserting it if missing (race-safe against concurrent creates)"""
+    if company_name is None:
+        company = (await db.execute(SELECT_COMPANY_WITHOUT_NAME)).scalar_one_or_none()
+    else:
+        company = (await db.execute(
+            SELECT_COMPANY_BY_NAME, {"company_name": company_name}
+        )).scalar_one_or_none()
+    if company:
+        return company
+    if company_name is None:
+        # NULL never matches the unique index, so there's nothing to upsert against
+        company = models.Company(company_name=None)
+        db.add(company)
+        await db.flush()  # assigns company_id; committed with the job
+        return company
+    await db.execute(
+        mysql_insert(models.Company)
+        .values(company_name=company_name)
+        .on_duplicate_key_update(company_name=models.Company.company_name)
+    )
+    logger.debug("🏢 Created new company: %s", company_name)
+    return (await db.execute(
+        SELECT_COMPANY_BY_NAME_FOR_UPDATE, {"company_name": company_name}
+    )).scalar_one()
 
 @app.post("/jobs")
-def create_job(job: schemas.JobCreate):
+async def create_job(job: schemas.JobCreate, db: AsyncSession = Depends(get_db)):
     """Create a new job posting"""
-    print(f"\n➕ Creating new job: {job.job_title}")
-    
-    db = get_db()
-    if not db:
-        raise HTTPException(status_code=500, detail="Database connection failed")
+    logger.debug("➕ Creating new job: %s", job.job_title)
     
     try:
-        # Get or create company
-        company = db.query(models.Company).filter_by(company_name=job.company_name).first()
-        if not company:
-            company = models.Company(company_name=job.company_name)
-            db.add(company)
-            db.commit()
-            db.refresh(company)
-            print(f"   🏢 Created new company: {job.company_name}")
+        company = await get_or_create_company(db, job.company_name)
         
         # Create job
         new_job = models.Job(
@@ -284,19 +486,13 @@ def create_job(job: schemas.JobCreate):
             work_year=job.work_year or 2024
         )
         
-        # Add skills
-        if job.skills:
-            for skill_name in job.skills:
-                skill = db.query(models.Skill).filter_by(skill_name=skill_name).first()
-                if not skill:
-                    skill = models.Skill(skill_name=skill_name)
-                    db.add(skill)
-                new_job.skills.append(skill)
-            print(f"   🎯 Added {len(job.skills)} skills")
+        # Add skills (always assigned so the response never lazy-loads the collection)
+        new_job.skills = await get_or_create_skills(db, job.skills) if job.skills else []
+        logger.debug("🎯 Added %d skills", len(new_job.skills))
         
         db.add(new_job)
-        db.commit()
-        db.refresh(new_job)
+        await db.commit()
+        analytics_cache.clear()
         
         result = {
             "job_id": new_job.job_id,
@@ -308,38 +504,25 @@ def create_job(job: schemas.JobCreate):
             "skills": [{"skill_name": s.skill_name} for s in new_job.skills]
         }
         
-        print(f"✅ Job created successfully: ID {new_job.job_id}\n")
-        return result
+        logger.debug("✅ Job created successfully: ID %s", new_job.job_id)
+        return ORJSONResponse(result)  # plain ints/strs: skip jsonable_encoder
         
     except Exception as e:
-        db.rollback()
-        print(f"❌ Error creating job: {e}")
+        logger.error("❌ Error creating job: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        db.close()
 
 @app.put("/jobs/{job_id}")
-def update_job(job_id: int, job: schemas.JobCreate):
+async def update_job(job_id: int, job: schemas.JobCreate, db: AsyncSession = Depends(get_db)):
     """Update an existing job"""
-    print(f"\n✏️ Updating job ID: {job_id}")
-    
-    db = get_db()
-    if not db:
-        raise HTTPException(status_code=500, detail="Database connection failed")
+    logger.debug("✏️ Updating job ID: %s", job_id)
     
     try:
-        existing_job = db.query(models.Job).filter_by(job_id=job_id).first()
+        existing_job = (await db.execute(SELECT_JOB_BY_ID, {"job_id": job_id})).scalar_one_or_none()
         if not existing_job:
-            print(f"❌ Job {job_id} not found")
+            logger.debug("❌ Job %s not found", job_id)
             raise HTTPException(status_code=404, detail="Job not found")
         
-        # Get or create company
-        company = db.query(models.Company).filter_by(company_name=job.company_name).first()
-        if not company:
-            company = models.Company(company_name=job.company_name)
-            db.add(company)
-            db.commit()
-            db.refresh(company)
+        company = await get_or_create_company(db, job.company_name)
         
         # Update job fields
         existing_job.job_title = job.job_title
@@ -356,15 +539,10 @@ def update_job(job_id: int, job: schemas.JobCreate):
         # Update skills
         existing_job.skills.clear()
         if job.skills:
-            for skill_name in job.skills:
-                skill = db.query(models.Skill).filter_by(skill_name=skill_name).first()
-                if not skill:
-                    skill = models.Skill(skill_name=skill_name)
-                    db.add(skill)
-                existing_job.skills.append(skill)
+            existing_job.skills.extend(await get_or_create_skills(db, job.skills))
         
-        db.commit()
-        db.refresh(existing_job)
+        await db.commit()
+        analytics_cache.clear()
         
         result = {
             "job_id": existing_job.job_id,
@@ -376,49 +554,44 @@ def update_job(job_id: int, job: schemas.JobCreate):
             "skills": [{"skill_name": s.skill_name} for s in existing_job.skills]
         }
         
-        print(f"✅ Job {job_id} updated successfully\n")
-        return result
+        logger.debug("✅ Job %s updated successfully", job_id)
+        return ORJSONResponse(result)  # plain ints/strs: skip jsonable_encoder
         
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        print(f"❌ Error updating job: {e}")
+        logger.error("❌ Error updating job: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        db.close()
 
 @app.delete("/jobs/{job_id}")
-def delete_job(job_id: int):
+async def delete_job(job_id: int, db: AsyncSession = Depends(get_db)):
     """Delete a job"""
-    print(f"\n🗑️ Deleting job ID: {job_id}")
-    
-    db = get_db()
-    if not db:
-        raise HTTPException(status_code=500, detail="Database connection failed")
+    logger.debug("🗑️ Deleting job ID: %s", job_id)
     
     try:
-        job = db.query(models.Job).filter_by(job_id=job_id).first()
+        job = await db.get(models.Job, job_id)
         if not job:
-            print(f"❌ Job {job_id} not found")
+            logger.debug("❌ Job %s not found", job_id)
             raise HTTPException(status_code=404, detail="Job not found")
         
-        db.delete(job)
-        db.commit()
+        # Explicit, so databases created before job_skills had ON DELETE CASCADE still work
+        # (the relationship uses passive_deletes and won't load the collection to do it)
+        await db.execute(DELETE_JOB_SKILLS, {"job_id": job_id})
+        await db.delete(job)
+        await db.commit()
+        analytics_cache.clear()
         
-        print(f"✅ Job {job_id} deleted successfully\n")
+        logger.debug("✅ Job %s deleted successfully", job_id)
         return {"message": "Job deleted successfully", "job_id": job_id}
         
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        print(f"❌ Error deleting job: {e}")
+        logger.error("❌ Error deleting job: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        db.close()
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     print("\n" + "="*60)
     print("🚀 Job Trends API Server")
     print("="*60)
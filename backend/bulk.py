@@ -0,0 +1,126 @@
+from contextlib import contextmanager
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from db import SessionLocal
+import models
+
+# Rows per executemany call; PyMySQL rewrites each call into one multi-row INSERT ... VALUES
+BATCH_SIZE = 1000
+
+# Insertable columns: ids are assigned here, generated columns are computed by MySQL
+JOB_COLUMNS = {c.name for c in models.Job.__table__.columns if c.computed is None} - {"job_id", "company_id"}
+
+
+@contextmanager
+def _load_checks_disabled(conn):
+    """Turn off InnoDB's per-row unique/FK checks on this connection for the block (MySQL only)"""
+    if conn.dialect.name != "mysql":
+        yield
+        return
+    conn.execute(text("SET SESSION unique_checks=0, foreign_key_checks=0"))
+    try:
+        yield
+    finally:
+        # Session variables outlive the transaction on the pooled connection,
+        # so restore them before commit/rollback hands the connection back
+        try:
+            conn.execute(text("SET SESSION unique_checks=1, foreign_key_checks=1"))
+        except Exception:
+            conn.invalidate()  # never pool a connection with the checks off
+            raise
+
+
+def _batches(items, size=BATCH_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _resolve_ids(db, model, name_col, id_col, names):
+    """
+    Map names to ids with one SELECT ... IN, upserting the missing names in one batch.
+    The DB matches names case- and accent-insensitively, so rows are matched back by
+    collation_key; raises ValueError for any name that still has no id.
+    """
+    if not names:
+        return {}
+    name_attr, id_attr = getattr(model, name_col), getattr(model, id_col)
+    by_key = {}
+    for n in names:
+        by_key.setdefault(models.collation_key(n), n)
+    ids = {
+        models.collation_key(name): id_
+        for name, id_ in db.execute(select(name_attr, id_attr).where(name_attr.in_(names))).all()
+    }
+
+    missing = [n for key, n in by_key.items() if key not in ids]
+    if missing:
+        # No-op on duplicates, so a concurrent load of the same names doesn't fail
+        db.execute(mysql_insert(model).on_duplicate_key_update({name_col: name_attr}), [{name_col: n} for n in missing])
+        # Locking read: sees names a concurrent load committed after our snapshot was taken
+        ids.update(
+            (models.collation_key(name), id_)
+            for name, id_ in db.execute(
+                select(name_attr, id_attr).where(name_attr.in_(missing)).with_for_update()
+            ).all()
+        )
+
+    unresolved = sorted(n for key, n in by_key.items() if key not in ids)
+    if unresolved:
+        raise ValueError(f"could not resolve {name_col} for: {', '.join(unresolved)}")
+    return {n: ids[models.collation_key(n)] for n in names}
+
+
+def bulk_load_jobs(rows):
+    """
+    Insert many jobs in batched multi-row INSERTs inside a single transaction.
+    Each row is a dict of Job column values plus "company_name" and an optional
+    "skills" list of skill names. Returns the number of jobs inserted.
+
+    Unique and foreign key checks are off for the job and job_skills inserts only;
+    the company/skill upserts before them need the unique indexes. For large ETL
+    runs, innodb_flush_log_at_trx_commit=2 in my.cnf also helps.
+
+    Job ids are assigned from MAX(job_id) + 1, so don't run a load while the API
+    is taking writes: a concurrent POST /jobs can take an id in the same range.
+    """
+    db = SessionLocal()
+    try:
+        company_ids = _resolve_ids(
+            db, models.Company, "company_name", "company_id",
+            {r["company_name"] for r in rows if r.get("company_name")}
+        )
+        skill_ids = _resolve_ids(
+            db, models.Skill, "skill_name", "skill_id",
+            {s for r in rows for s in r.get("skills", [])}
+        )
+
+        # Job ids are assigned here so job_skills rows can be built without a
+        # lastrowid round-trip per job (MySQL has no INSERT ... RETURNING).
+        # FOR UPDATE only serializes concurrent loads: an AUTO_INCREMENT insert takes
+        # its id before any row lock (innodb_autoinc_lock_mode=2) and can collide
+        # with this range, so loads must not overlap API writes.
+        next_id = db.execute(
+            select(func.coalesce(func.max(models.Job.job_id), 0)).with_for_update()
+        ).scalar() + 1
+
+        job_rows, pair_rows = [], []
+        for job_id, row in enumerate(rows, start=next_id):
+            job = {k: v for k, v in row.items() if k in JOB_COLUMNS}
+            job["job_id"] = job_id
+            job["company_id"] = company_ids[row["company_name"]] if row.get("company_name") else None
+            job_rows.append(job)
+            pair_rows.extend({"job_id": job_id, "skill_id": skill_ids[s]} for s in set(row.get("skills", [])))
+
+        with _load_checks_disabled(db.connection()):
+            for batch in _batches(job_rows):
+                db.execute(insert(models.Job), batch)
+            for batch in _batches(pair_rows):
+                db.execute(models.job_skills.insert(), batch)
+
+        db.commit()
+        return len(job_rows)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
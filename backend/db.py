@@ -1,47 +1,96 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import logging
+import os
+from dotenv import load_dotenv
+from sqlalchemy import URL, create_engine, make_url
+from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 
-# 1. CREDENTIALS
-DB_USER = "root"
-DB_PASS = "admin123"
-DB_HOST = "127.0.0.1"
-DB_PORT = 3306
-DB_NAME = "job_trends"
+# 1. CONNECTION SETTINGS (environment, or backend/.env for local development)
+load_dotenv()
 
-# 2. CONNECTION STRING
-DATABASE_URL = f"mysql+pymysql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}?charset=utf8mb4"
+# DATABASE_URL wins; otherwise the URL is assembled from the DB_* variables
+DATABASE_URL = make_url(os.getenv("DATABASE_URL") or URL.create(
+    "mysql+pymysql",
+    username=os.getenv("DB_USER", "root"),
+    password=os.getenv("DB_PASS"),
+    host=os.getenv("DB_HOST", "127.0.0.1"),
+    port=int(os.getenv("DB_PORT", 3306)),
+    database=os.getenv("DB_NAME", "job_trends"),
+    query={"charset": "utf8mb4"},
+))
+ASYNC_DATABASE_URL = DATABASE_URL.set(drivername="mysql+aiomysql")
 
-print(f"\n >>> DEBUG: db.py is loaded. Connecting as {DB_USER} to {DB_NAME}...\n")
+# Connect once at import to fail fast with troubleshooting hints (off by default: it slows cold start)
+DB_STARTUP_CHECK = bool(os.getenv("DB_STARTUP_CHECK"))
+
+# 2. POOL SIZING, per engine and per worker process. MySQL's default max_connections
+# is 151, so keep workers * 2 engines * (DB_POOL_SIZE + DB_MAX_OVERFLOW) below it.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 20))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 30))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))
+
+logger = logging.getLogger("job_trends.db")
+logger.debug("db.py is loaded. Connecting as %s to %s...", DATABASE_URL.username, DATABASE_URL.database)
 
 # 3. ENGINE with better configuration
-try:
-    engine = create_engine(
-        DATABASE_URL, 
-        pool_pre_ping=True,      # Test connection before using
-        pool_recycle=3600,       # Recycle connections after 1 hour
-        echo=False,              # Set True to see SQL queries (useful for debugging)
-        pool_size=5,             # Number of connections to keep
-        max_overflow=10          # Max additional connections when pool is full
-    )
-    
-    # Test the connection immediately
-    with engine.connect() as conn:
-        print("✅ Database connection successful!")
-        
-except Exception as e:
-    print(f"❌ Database connection failed: {e}")
-    print("\n🔧 Troubleshooting:")
-    print(f"1. Is MySQL running? Test with: mysql -u {DB_USER} -p")
-    print(f"2. Does database '{DB_NAME}' exist?")
-    print(f"   CREATE DATABASE {DB_NAME};")
-    print("3. Are credentials correct?")
-    print("4. Install: pip install pymysql cryptography")
-    raise
-
-# 4. SESSION MAKER
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
-
-# 5. BASE CLASS
-Base = declarative_base()
-
-print("✅ SQLAlchemy configured successfully\n")
+engine = create_engine(
+    DATABASE_URL,
+    pool_pre_ping=True,      # Test connection before using
+    pool_recycle=3600,       # Recycle connections after 1 hour
+    echo=False,              # Set True to see SQL queries (useful for debugging)
+    pool_size=DB_POOL_SIZE,          # Number of connections to keep
+    max_overflow=DB_MAX_OVERFLOW,    # Max additional connections when pool is full
+    pool_timeout=DB_POOL_TIMEOUT,    # Seconds to wait for a free connection before erroring
+    query_cache_size=5000            # Compiled-SQL cache entries (default 500)
+)
+
+if DB_STARTUP_CHECK:
+    try:
+        with engine.connect() as conn:
+            logger.info("✅ Database connection successful!")
+        logger.info("Pool: %s", engine.pool.status())
+    except Exception as e:
+        logger.error(
+            "❌ Database connection failed: %s\n"
+            "🔧 Troubleshooting:\n"
+            "1. Is MySQL running? Test with: mysql -u %s -p\n"
+            "2. Does database '%s' exist?\n"
+            "   CREATE DATABASE %s;\n"
+            "3. Are DATABASE_URL / DB_USER / DB_PASS correct?\n"
+            "4. Install: pip install pymysql cryptography",
+            e, DATABASE_URL.username, DATABASE_URL.database, DATABASE_URL.database
+        )
+        raise
+
+# 4. ASYNC ENGINE (used by the API so DB I/O doesn't block the event loop)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_pre_ping=True,
+    pool_recycle=3600,
+    echo=False,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    query_cache_size=5000
+)
+
+# 5. SESSION MAKERS
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)  # scripts / create_all
+AsyncSessionLocal = async_sessionmaker(  # API endpoints
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+async def get_db():
+    """FastAPI dependency: request-scoped session, rolled back if the handler raises"""
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception:
+            await db.rollback()
+            raise
+
+# 6. BASE CLASS
+class Base(DeclarativeBase):
+    pass
+
+logger.debug("✅ SQLAlchemy configured successfully")
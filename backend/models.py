@@ -1,48 +1,90 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Table
-from sqlalchemy.orm import relationship
+import unicodedata
+from typing import List, Optional
+from sqlalchemy import CHAR, Column, Computed, Enum, Integer, String, ForeignKey, Table, Index
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from db import Base
 
+# Closed value sets, stored as MySQL ENUM (1 byte per row instead of a utf8mb4 string)
+EXPERIENCE_LEVELS = ("Entry-level", "Mid-level", "Senior", "Executive")
+COMPANY_SIZES = ("Small", "Medium", "Large")
+
+# Emitted by create_all on MySQL; ignored by other dialects
+MYSQL_TABLE_OPTIONS = {"mysql_engine": "InnoDB", "mysql_charset": "utf8mb4", "mysql_row_format": "DYNAMIC"}
+
+
+def collation_key(name: str) -> str:
+    """Approximate how utf8mb4_0900_ai_ci compares names: case- and accent-insensitive"""
+    decomposed = unicodedata.normalize("NFKD", name)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
 job_skills = Table(
     "job_skills",
     Base.metadata,
-    Column("job_id", Integer, ForeignKey("jobs.job_id"), primary_key=True),
-    Column("skill_id", Integer, ForeignKey("skills.skill_id"), primary_key=True)
+    Column("job_id", Integer, ForeignKey("jobs.job_id", ondelete="CASCADE"), primary_key=True),
+    Column("skill_id", Integer, ForeignKey("skills.skill_id", ondelete="CASCADE"), primary_key=True),
+    # Reverse lookup ("jobs with skill X"); the primary key covers job_id first
+    Index("ix_job_skills_skill_job", "skill_id", "job_id"),
+    **MYSQL_TABLE_OPTIONS
 )
 
 class Company(Base):
     __tablename__ = "companies"
-    company_id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    company_name = Column(String(255), unique=True, index=True)
-    jobs = relationship("Job", back_populates="company")
+    __table_args__ = MYSQL_TABLE_OPTIONS
+    company_id: Mapped[int] = mapped_column(primary_key=True, index=True, autoincrement=True)
+    company_name: Mapped[Optional[str]] = mapped_column(String(255), unique=True, index=True)
+    jobs: Mapped[List["Job"]] = relationship(back_populates="company")
 
 class Skill(Base):
     __tablename__ = "skills"
-    skill_id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    skill_name = Column(String(100), unique=True)
-    jobs = relationship("Job", secondary=job_skills, back_populates="skills")
+    __table_args__ = MYSQL_TABLE_OPTIONS
+    skill_id: Mapped[int] = mapped_column(primary_key=True, index=True, autoincrement=True)
+    skill_name: Mapped[Optional[str]] = mapped_column(String(100), unique=True)
+    jobs: Mapped[List["Job"]] = relationship(secondary=job_skills, back_populates="skills", passive_deletes=True)
 
 class Job(Base):
     __tablename__ = "jobs"
-    job_id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    company_id = Column(Integer, ForeignKey("companies.company_id"))
+    __table_args__ = (
+        # Analytics GROUP BYs; (work_year, min_salary) covers the salary trend on its own
+        Index("ix_jobs_work_year_min_salary", "work_year", "min_salary"),
+        Index("ix_jobs_work_setting", "work_setting"),
+        Index("ix_jobs_company_size", "company_size"),
+        # Dashboard filter/group shapes
+        Index("ix_jobs_year_category", "work_year", "job_category"),
+        Index("ix_jobs_exp_setting", "experience_level", "work_setting"),
+        Index("ix_jobs_company_year", "company_id", "work_year"),
+        Index("ix_jobs_salary_usd", "salary_in_usd"),
+        Index("ix_jobs_midpoint_category", "job_category", "salary_midpoint"),
+        MYSQL_TABLE_OPTIONS,
+    )
+    # Don't fetch server-generated values (salary_midpoint) back after INSERT/UPDATE
+    __mapper_args__ = {"eager_defaults": False}
+    job_id: Mapped[int] = mapped_column(primary_key=True, index=True, autoincrement=True)
+    company_id: Mapped[Optional[int]] = mapped_column(ForeignKey("companies.company_id"))
     
-    # Core Fields
-    job_title = Column(String(255))
-    location = Column(String(255))
-    min_salary = Column(Integer)
-    max_salary = Column(Integer)
+    # Core Fields (widths sized to the dataset; utf8mb4 index keys cost 4 bytes/char)
+    job_title: Mapped[Optional[str]] = mapped_column(String(160))
+    location: Mapped[Optional[str]] = mapped_column(String(120))
+    min_salary: Mapped[Optional[int]]
+    max_salary: Mapped[Optional[int]]
+    # Stored by MySQL on write (NULL if either bound is missing); never set from Python.
+    # Deferred: only analytics queries select it, so entity loads work on pre-existing tables too
+    salary_midpoint: Mapped[Optional[int]] = mapped_column(
+        Computed("(min_salary + max_salary) / 2", persisted=True), deferred=True
+    )
     
     # Analytics Fields
-    work_year = Column(Integer)
-    job_category = Column(String(100))
-    salary_currency = Column(String(10))
-    salary = Column(Integer)
-    salary_in_usd = Column(Integer)
-    employee_residence = Column(String(255))
-    experience_level = Column(String(50))
-    employment_type = Column(String(50))
-    work_setting = Column(String(50))
-    company_size = Column(String(10))
-
-    company = relationship("Company", back_populates="jobs")
-    skills = relationship("Skill", secondary=job_skills, back_populates="jobs")
+    work_year: Mapped[Optional[int]]
+    job_category: Mapped[Optional[str]] = mapped_column(String(64))  # leads ix_jobs_midpoint_category
+    salary_currency: Mapped[Optional[str]] = mapped_column(CHAR(3))  # ISO 4217 code
+    salary: Mapped[Optional[int]]
+    salary_in_usd: Mapped[Optional[int]]
+    employee_residence: Mapped[Optional[str]] = mapped_column(String(120))
+    experience_level: Mapped[Optional[str]] = mapped_column(Enum(*EXPERIENCE_LEVELS, name="experience_level"))
+    employment_type: Mapped[Optional[str]] = mapped_column(String(16))
+    work_setting: Mapped[Optional[str]] = mapped_column(String(16))
+    company_size: Mapped[Optional[str]] = mapped_column(Enum(*COMPANY_SIZES, name="company_size"))
+
+    # Loaded per query (see load_jobs_full in queries.py) rather than eagerly everywhere
+    company: Mapped[Optional["Company"]] = relationship(back_populates="jobs")
+    # passive_deletes: the job_skills FKs cascade in MySQL, so deletes don't load the collection first
+    skills: Mapped[List["Skill"]] = relationship(secondary=job_skills, back_populates="jobs", passive_deletes=True)
@@ -0,0 +1,124 @@
+"""
+Hot statements, built once at import so every request hits SQLAlchemy's
+compiled-statement cache. Per-request values go in as bind parameters.
+"""
+import os
+from sqlalchemy import String, bindparam, cast, delete, func, literal, null, select, text, union_all
+from sqlalchemy.orm import load_only, raiseload, selectinload
+import models
+
+DEBUG = bool(os.getenv("DEBUG"))
+
+SELECT_JOB_COUNT = select(func.count(models.Job.job_id))
+
+# Whatever columns the table really has (not the model's), for /debug/job_columns
+SELECT_SAMPLE_JOB_ROW = text("SELECT * FROM jobs LIMIT 1")
+
+SELECT_JOB_ROWS_ESTIMATE = text(
+    "SELECT TABLE_ROWS FROM information_schema.TABLES "
+    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'jobs'"
+)
+
+# Totals and all jobs-table group-bys for the summary in one UNION ALL round-trip;
+# rows come back as (kind, label, value)
+SELECT_SUMMARY_AGGREGATES = union_all(
+    select(
+        literal("total"), null(), func.count(models.Job.job_id)
+    ),
+    select(
+        literal("avg"), null(), func.avg(models.Job.min_salary)
+    ),
+    select(
+        literal("year"),
+        cast(models.Job.work_year, String),
+        func.avg(models.Job.min_salary)
+    ).where(
+        models.Job.work_year.isnot(None)
+    ).group_by(models.Job.work_year),
+    select(
+        literal("work_setting"),
+        models.Job.work_setting,
+        func.count(models.Job.job_id)
+    ).where(
+        models.Job.work_setting.isnot(None)
+    ).group_by(models.Job.work_setting),
+    select(
+        literal("company_size"),
+        models.Job.company_size,
+        func.count(models.Job.job_id)
+    ).where(
+        models.Job.company_size.isnot(None)
+    ).group_by(models.Job.company_size)
+)
+
+# Plain text() aggregate: no ORM entities involved, just (name, count) tuples
+SELECT_TOP_SKILLS = text(
+    "SELECT s.skill_name, COUNT(*) AS cnt "
+    "FROM skills s JOIN job_skills js ON js.skill_id = s.skill_id "
+    "GROUP BY s.skill_name "
+    "ORDER BY cnt DESC "
+    "LIMIT 10"
+)
+
+def load_jobs_full(*columns):
+    """
+    Jobs with company and skills eager-loaded (one IN query each), for endpoints that serialize them.
+    Pass Job columns to load only those (plus the primary key) instead of the whole row.
+    """
+    company, skills = selectinload(models.Job.company), selectinload(models.Job.skills)
+    if columns:
+        # The list payload only needs the company and skill names
+        company = company.load_only(models.Company.company_name)
+        skills = skills.load_only(models.Skill.skill_name)
+    stmt = select(models.Job).options(company, skills)
+    if columns:
+        stmt = stmt.options(load_only(*columns))
+    if DEBUG:
+        # Fail loudly on any other relationship access instead of lazy-loading it
+        stmt = stmt.options(raiseload("*"))
+    return stmt
+
+# What schemas.JobResponse serializes; company_id is needed to load the company
+JOB_LIST_COLUMNS = (
+    models.Job.company_id,
+    models.Job.job_title,
+    models.Job.location,
+    models.Job.min_salary,
+    models.Job.max_salary,
+    models.Job.work_year,
+    models.Job.job_category,
+    models.Job.experience_level,
+    models.Job.employment_type,
+    models.Job.work_setting,
+    models.Job.company_size,
+)
+
+SELECT_JOBS_PAGE = load_jobs_full(*JOB_LIST_COLUMNS).order_by(models.Job.job_id)  # stable order for chunked paging
+
+SELECT_COMPANY_BY_NAME = select(models.Company).where(
+    models.Company.company_name == bindparam("company_name")
+)
+
+# "= NULL" never matches, so jobs without a company name share the first NULL-named company
+SELECT_COMPANY_WITHOUT_NAME = select(models.Company).where(
+    models.Company.company_name.is_(None)
+).limit(1)
+
+SELECT_SKILLS_BY_NAME = select(models.Skill).where(
+    models.Skill.skill_name.in_(bindparam("names", expanding=True))
+)
+
+# Locking reads for the re-select after an upsert. Under REPEATABLE READ a plain SELECT
+# reads the transaction's snapshot and misses a row a concurrent request just committed;
+# FOR UPDATE reads the latest committed version.
+SELECT_COMPANY_BY_NAME_FOR_UPDATE = SELECT_COMPANY_BY_NAME.with_for_update()
+SELECT_SKILLS_BY_NAME_FOR_UPDATE = SELECT_SKILLS_BY_NAME.with_for_update()
+
+# Skills loaded up front: lazy loads aren't allowed on an AsyncSession
+SELECT_JOB_BY_ID = select(models.Job).options(
+    selectinload(models.Job.skills)
+).where(models.Job.job_id == bindparam("job_id"))
+
+DELETE_JOB_SKILLS = delete(models.job_skills).where(
+    models.job_skills.c.job_id == bindparam("job_id")
+)
@@ -1,23 +1,47 @@
-from pydantic import BaseModel, ConfigDict
-from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
+from typing import Annotated, List, Optional
+import models
+from models import COMPANY_SIZES, EXPERIENCE_LEVELS
 
-# Shared properties
-class JobBase(BaseModel):
-    job_title: str
-    location: str
+def column_width(attr) -> int:
+    """VARCHAR width declared in models.py, so oversized input is a 422 instead of a MySQL DataError"""
+    return attr.type.length
+
+# Fields shared by requests and responses
+class JobReadBase(BaseModel):
+    # Optional on reads: the columns are nullable, and one NULL must not fail a whole /jobs chunk
+    job_title: Optional[str] = None
+    location: Optional[str] = None
     min_salary: Optional[int] = None
     max_salary: Optional[int] = None
     
     # Additional fields
-    company_name: Optional[str] = None  # For creating jobs
     experience_level: Optional[str] = None
     work_setting: Optional[str] = None
     work_year: Optional[int] = None
     job_category: Optional[str] = None
     company_size: Optional[str] = None
 
-class JobCreate(JobBase):
-    skills: List[str] = []
+class JobCreate(JobReadBase):
+    job_title: str = Field(max_length=column_width(models.Job.job_title))
+    location: str = Field(max_length=column_width(models.Job.location))
+    work_setting: Optional[str] = Field(None, max_length=column_width(models.Job.work_setting))
+    job_category: Optional[str] = Field(None, max_length=column_width(models.Job.job_category))
+
+    # Write-only: responses carry the nested company instead
+    company_name: Optional[str] = Field(None, max_length=column_width(models.Company.company_name))
+    skills: List[Annotated[str, Field(max_length=column_width(models.Skill.skill_name))]] = []
+
+    @field_validator("experience_level", "company_size", mode="before")
+    @classmethod
+    def check_closed_values(cls, value, info):
+        # Forms send "" for "not selected"; anything else must be a stored ENUM value
+        if value == "":
+            return None
+        allowed = EXPERIENCE_LEVELS if info.field_name == "experience_level" else COMPANY_SIZES
+        if value is not None and value not in allowed:
+            raise ValueError(f"must be one of {', '.join(allowed)}")
+        return value
 
 class Skill(BaseModel):
     skill_name: str
@@ -25,13 +49,17 @@ class Skill(BaseModel):
     model_config = ConfigDict(from_attributes=True)  # Updated for Pydantic v2
 
 class Company(BaseModel):
-    company_name: str
+    company_name: Optional[str] = None  # jobs created without a company name get a NULL-named company
     
     model_config = ConfigDict(from_attributes=True)  # Updated for Pydantic v2
 
-class JobResponse(JobBase):
+class JobResponse(JobReadBase):
     job_id: int
+    employment_type: Optional[str] = None
     company: Optional[Company] = None
     skills: List[Skill] = []
 
     model_config = ConfigDict(from_attributes=True)  # Updated for Pydantic v2
+
+# Built once: validates/serializes a whole page of ORM rows in pydantic-core
+JobResponseListAdapter = TypeAdapter(List[JobResponse])
@@ -1,7 +1,8 @@
 import pandas as pd
 import os
-from sqlalchemy import text
+from sqlalchemy import func, select, text
 from db import SessionLocal, engine
+from bulk import bulk_load_jobs
 import models
 
 # --- CONFIGURATION ---
@@ -36,7 +37,7 @@ def seed_data():
     try:
         # --- SAFETY CHECK ---
         # Check if data already exists to avoid duplicates
-        existing_jobs = db.query(models.Job).count()
+        existing_jobs = db.scalar(select(func.count(models.Job.job_id)))
         if existing_jobs > 0:
             print(f"⚠️  Database already contains {existing_jobs} jobs.")
             print("   Skipping seed to prevent duplicates. (No changes made)")
@@ -57,68 +58,33 @@ def seed_data():
         # Ensure tables exist (Safe Create)
         models.Base.metadata.create_all(bind=engine)
 
-        # 3. Create Skills
-        print("🌱 Creating Skills...")
-        all_skills = set([s for sublist in CAT_SKILLS.values() for s in sublist])
-        skill_objs = {}
-        for s_name in all_skills:
-            # Check if skill exists (Edge case safety)
-            s = db.query(models.Skill).filter_by(skill_name=s_name).first()
-            if not s:
-                s = models.Skill(skill_name=s_name)
-                db.add(s)
-            skill_objs[s_name] = s
-        db.commit()
+        # 3. Build job rows (companies and skills are created by the bulk loader)
+        print(f"🌱 Preparing {len(df)} Jobs...")
+        rows = []
+        for row in df.itertuples(index=False):
+            sal = int(row.salary_in_usd)
+            rows.append({
+                "job_title": row.job_title,
+                "location": row.company_location,
+                "min_salary": int(sal * 0.9),
+                "max_salary": int(sal * 1.1),
+                "company_name": f"Employers in {row.company_location}",
 
-        # 4. Create Companies
-        print("🌱 Creating Companies...")
-        locations = df['company_location'].unique()
-        comp_objs = {}
-        for loc in locations:
-            c_name = f"Employers in {loc}"
-            c = db.query(models.Company).filter_by(company_name=c_name).first()
-            if not c:
-                c = models.Company(company_name=c_name)
-                db.add(c)
-            comp_objs[loc] = c
-        db.commit()
-
-        # 5. Insert Jobs
-        print(f"🌱 Inserting {len(df)} Jobs...")
-        counter = 0
-        for _, row in df.iterrows():
-            loc = row['company_location']
-            sal = int(row['salary_in_usd'])
-            
-            job = models.Job(
-                job_title=row['job_title'],
-                location=loc,
-                min_salary=int(sal * 0.9),
-                max_salary=int(sal * 1.1),
-                company_id=comp_objs[loc].company_id,
-                
                 # Mapped Columns
-                experience_level=EXP_MAP.get(row['experience_level'], row['experience_level']),
-                work_setting=row['work_setting'],
-                work_year=row['work_year'],
-                job_category=row['job_category'],
-                company_size=SIZE_MAP.get(row['company_size'], row['company_size'])
-            )
+                "experience_level": EXP_MAP.get(row.experience_level, row.experience_level),
+                "work_setting": row.work_setting,
+                "work_year": int(row.work_year),
+                "job_category": row.job_category,
+                "company_size": SIZE_MAP.get(row.company_size, row.company_size),
 
-            # Link Skills
-            cat_skills = CAT_SKILLS.get(row['job_category'], [])
-            for s in cat_skills:
-                # Ensure the skill object is attached to the session
-                if s in skill_objs:
-                    job.skills.append(skill_objs[s])
-            
-            db.add(job)
-            counter += 1
-            if counter % 500 == 0:
-                print(f"   ... {counter} added")
-                db.commit()
+                # Link Skills
+                "skills": CAT_SKILLS.get(row.job_category, []),
+            })
 
-        db.commit()
+        # 4. Insert Jobs, companies and skills in batched multi-row INSERTs
+        print(f"🌱 Inserting {len(rows)} Jobs...")
+        inserted = bulk_load_jobs(rows)
+        print(f"   ... {inserted} added")
         print("✅ SUCCESS! Database populated successfully.")
 
     except Exception as e: